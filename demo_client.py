@@ -4,18 +4,19 @@ MCP Client Demo - Demonstrates the complete MCP lifecycle
 """
 
 import asyncio
-import sys
+import importlib.util
 import os
 
-# Add the client directory to the path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'mcp_client'))
-
-try:
-    from client import MCPClient
-except ImportError:
-    # If import fails, try direct import
-    sys.path.append('mcp_client')
-    from client import MCPClient
+# Load the client module directly from its file instead of mutating
+# sys.path - deterministic, and no extra path entries for the import
+# system to rescan
+_client_spec = importlib.util.spec_from_file_location(
+    "client",
+    os.path.join(os.path.dirname(__file__), "mcp_client", "client.py")
+)
+_client_module = importlib.util.module_from_spec(_client_spec)
+_client_spec.loader.exec_module(_client_module)
+MCPClient = _client_module.MCPClient
 
 
 async def demo_lifecycle():
@@ -58,23 +59,20 @@ async def demo_lifecycle():
         
         # Step 4: Demo tool calls
         print("\nStep 4: Demonstrating tool calls...")
-        
-        # Call hello tool
-        print("\n🔧 Calling 'hello' tool:")
-        await client.call_tool("hello", {"name": "MCP Demo User"})
-        
-        # Call echo tool
-        print("\n🔧 Calling 'echo' tool:")
-        await client.call_tool("echo", {"message": "Hello from MCP Client Demo!"})
-        
-        # Call get_time tool
-        print("\n🔧 Calling 'get_time' tool:")
-        await client.call_tool("get_time", {})
-        
-        # Call add_numbers tool
-        print("\n🔧 Calling 'add_numbers' tool:")
-        await client.call_tool("add_numbers", {"a": 42, "b": 8})
-        
+
+        # Fire all four calls concurrently - the client pipelines them, so
+        # the demo pays one round-trip instead of four
+        results = await asyncio.gather(
+            client.call_tool("hello", {"name": "MCP Demo User"}),
+            client.call_tool("echo", {"message": "Hello from MCP Client Demo!"}),
+            client.call_tool("get_time", {}),
+            client.call_tool("add_numbers", {"a": 42, "b": 8}),
+        )
+
+        print("\n📊 Tool call results:")
+        for tool_name, result in zip(("hello", "echo", "get_time", "add_numbers"), results):
+            print(f"   • {tool_name}: {result}")
+
         print("\n✅ Demo completed successfully!")
         print("\n🎮 To try interactive mode, run: py mcp_client/client.py")
         
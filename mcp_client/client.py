@@ -11,64 +11,100 @@ This client demonstrates:
 """
 
 import asyncio
+import itertools
 import json
-import subprocess
 import sys
 import time
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
+# Prefer orjson for (de)serialization on the RPC hot path - it is several
+# times faster than the stdlib for the small messages used here.
+# Note: the MCP stdio transport is newline-delimited JSON, so frames must
+# stay on one line; both serializers below guarantee compact, newline-free
+# output, which also keeps the readline() scan as short as possible.
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
+
+# The JSON-RPC envelope is the same for every message, so splice it together
+# from template bytes instead of building and re-encoding a dict per call.
+# Only the params payload goes through the serializer. Method names are
+# plain identifiers/paths, so no JSON escaping is needed for them.
+_REQUEST_PREFIX = b'{"jsonrpc":"2.0","id":'
+_NOTIFICATION_PREFIX = b'{"jsonrpc":"2.0","method":"'
+
+
+def _frame_request(request_id: int, method: str, params: Optional[Dict[str, Any]]) -> bytes:
+    frame = _REQUEST_PREFIX + str(request_id).encode() + b',"method":"' + method.encode() + b'"'
+    if params:
+        frame += b',"params":' + _json_dumps(params)
+    return frame + b'}\n'
+
+
+def _frame_notification(method: str) -> bytes:
+    return _NOTIFICATION_PREFIX + method.encode() + b'"}\n'
+
 
 @dataclass
 class MCPTool:
     """Represents an MCP tool."""
+    __slots__ = ("name", "description", "input_schema")
     name: str
     description: str
     input_schema: Dict[str, Any]
 
 
-@dataclass
-class MCPResponse:
-    """Represents an MCP response."""
-    id: Optional[int]
-    result: Optional[Dict[str, Any]]
-    error: Optional[Dict[str, Any]]
-    method: Optional[str]
-
-
 class MCPClient:
     """A simple MCP client that demonstrates the complete MCP lifecycle."""
     
     def __init__(self, server_command: List[str], server_cwd: str = None):
         self.server_command = server_command
         self.server_cwd = server_cwd
-        self.process: Optional[subprocess.Popen] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.tools: List[MCPTool] = []
+        self._tools_by_name: Dict[str, MCPTool] = {}
+        self._param_plans: Dict[str, List[Any]] = {}
         self.initialized = False
-        self.request_id = 0
+        self._next_id = itertools.count(1).__next__
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        self._tools_response: Optional[asyncio.Future] = None
     
     def _get_next_id(self) -> int:
         """Get the next request ID."""
-        self.request_id += 1
-        return self.request_id
+        return self._next_id()
     
     async def start_server(self) -> bool:
         """Start the MCP server process."""
         print("🚀 Starting MCP server...")
         try:
-            self.process = subprocess.Popen(
-                self.server_command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=self.server_cwd
+            self.process = await asyncio.create_subprocess_exec(
+                *self.server_command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.server_cwd,
+                # Raise the stream's line-length cap (64 KiB by default)
+                # so a large tools/list or tools/call reply on one line
+                # cannot kill the reader with LimitOverrunError
+                limit=4 * 1024 * 1024
             )
-            
-            # Give the server a moment to start
-            await asyncio.sleep(0.5)
-            
-            if self.process.poll() is None:
+
+            # No warmup sleep: the server is considered ready when it
+            # answers the initialize request, so spawning is enough here
+            if self.process.returncode is None:
+                self._reader_task = asyncio.create_task(self._read_loop())
                 print("✅ MCP server started successfully!")
                 return True
             else:
@@ -79,52 +115,61 @@ class MCPClient:
             print(f"❌ Error starting MCP server: {e}")
             return False
     
-    async def send_request(self, method: str, params: Dict[str, Any] = None, request_id: int = None) -> MCPResponse:
+    async def _read_loop(self):
+        """Read server output and dispatch responses to waiting requests.
+
+        This deliberately stays on the StreamReader: the subprocess
+        transport owns the pipe fds, so registering them with
+        loop.add_reader for raw os.read calls would double-register the
+        fd and race the transport's own reader.
+        """
+        async for line in self.process.stdout:
+            try:
+                # Both parsers tolerate the trailing newline, so no strip()
+                response_data = _json_loads(line)
+            except ValueError:
+                continue
+            future = self._pending.pop(response_data.get("id"), None)
+            if future and not future.done():
+                future.set_result(response_data)
+
+        # Server closed its stdout - fail any requests still in flight
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(Exception("No response from server"))
+        self._pending.clear()
+
+    async def send_request(self, method: str, params: Dict[str, Any] = None, request_id: int = None) -> Dict[str, Any]:
         """Send a JSON-RPC request to the MCP server."""
-        if not self.process or self.process.poll() is not None:
+        if not self.process or self.process.returncode is not None:
             raise Exception("MCP server is not running")
-        
+
         if request_id is None:
             request_id = self._get_next_id()
-        
-        request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method
-        }
-        
-        if params:
-            request["params"] = params
-        
+
         print(f"📤 Sending request: {method}")
-        
-        # Send the request
-        self.process.stdin.write(json.dumps(request) + "\n")
-        self.process.stdin.flush()
-        
-        # Read the response
-        response_line = self.process.stdout.readline()
-        if not response_line:
-            raise Exception("No response from server")
-        
+
+        # Register for the response before writing, then send the request
+        # as a single pre-templated frame
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
         try:
-            response_data = json.loads(response_line.strip())
-            response = MCPResponse(
-                id=response_data.get("id"),
-                result=response_data.get("result"),
-                error=response_data.get("error"),
-                method=response_data.get("method")
-            )
-            
-            if response.error:
-                print(f"❌ Server error: {response.error}")
-            else:
-                print(f"📥 Received response for {method}")
-            
-            return response
-            
-        except json.JSONError as e:
-            raise Exception(f"Invalid JSON response: {e}")
+            self.process.stdin.write(_frame_request(request_id, method, params))
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            self._pending.pop(request_id, None)
+            raise Exception("MCP server exited before the request could be sent")
+
+        # Wait for the reader task to dispatch our response; hand the
+        # parsed dict straight back rather than wrapping it in a dataclass
+        response_data = await future
+
+        if response_data.get("error"):
+            print(f"❌ Server error: {response_data['error']}")
+        else:
+            print(f"📥 Received response for {method}")
+
+        return response_data
     
     async def initialize(self) -> bool:
         """Initialize the MCP connection."""
@@ -143,16 +188,33 @@ class MCPClient:
                 }
             )
             
-            if response.error:
-                print(f"❌ Initialization failed: {response.error}")
+            if response.get("error"):
+                print(f"❌ Initialization failed: {response['error']}")
                 return False
-            
+
+            server_info = response.get("result", {}).get("serverInfo", {})
             print("✅ MCP connection initialized!")
-            print(f"   Server: {response.result.get('serverInfo', {}).get('name', 'Unknown')}")
-            print(f"   Version: {response.result.get('serverInfo', {}).get('version', 'Unknown')}")
+            print(f"   Server: {server_info.get('name', 'Unknown')}")
+            print(f"   Version: {server_info.get('version', 'Unknown')}")
             
-            # Send initialized notification
-            await self.send_notification("notifications/initialized")
+            # Pipeline the initialized notification and the tools/list
+            # request into one write - the server processes them in order,
+            # so discover_tools can await the reply without another
+            # round-trip
+            request_id = self._get_next_id()
+
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            self._tools_response = future
+
+            print("📢 Sending notification: notifications/initialized")
+            print("📤 Sending request: tools/list")
+            self.process.stdin.writelines((
+                _frame_notification("notifications/initialized"),
+                _frame_request(request_id, "tools/list", None),
+            ))
+            await self.process.stdin.drain()
+
             self.initialized = True
             return True
             
@@ -162,27 +224,27 @@ class MCPClient:
     
     async def send_notification(self, method: str) -> None:
         """Send a notification (no response expected)."""
-        notification = {
-            "jsonrpc": "2.0",
-            "method": method
-        }
-        
         print(f"📢 Sending notification: {method}")
-        self.process.stdin.write(json.dumps(notification) + "\n")
-        self.process.stdin.flush()
+        self.process.stdin.write(_frame_notification(method))
+        await self.process.stdin.drain()
     
     async def discover_tools(self) -> bool:
         """Discover available tools from the MCP server."""
         print("\n🔍 Discovering available tools...")
         
         try:
-            response = await self.send_request("tools/list")
-            
-            if response.error:
-                print(f"❌ Tool discovery failed: {response.error}")
+            if self._tools_response is not None:
+                # initialize() already pipelined the tools/list request
+                response = await self._tools_response
+                self._tools_response = None
+            else:
+                response = await self.send_request("tools/list")
+
+            if response.get("error"):
+                print(f"❌ Tool discovery failed: {response['error']}")
                 return False
-            
-            tools_data = response.result.get("tools", [])
+
+            tools_data = response.get("result", {}).get("tools", [])
             self.tools = []
             
             for tool_data in tools_data:
@@ -192,7 +254,12 @@ class MCPClient:
                     input_schema=tool_data["inputSchema"]
                 )
                 self.tools.append(tool)
-            
+
+            self._tools_by_name = {tool.name: tool for tool in self.tools}
+            self._param_plans = {
+                tool.name: self._compile_param_plan(tool) for tool in self.tools
+            }
+
             print(f"✅ Found {len(self.tools)} tools:")
             for tool in self.tools:
                 print(f"   • {tool.name}: {tool.description}")
@@ -217,12 +284,12 @@ class MCPClient:
                 }
             )
             
-            if response.error:
-                print(f"❌ Tool call failed: {response.error}")
+            if response.get("error"):
+                print(f"❌ Tool call failed: {response['error']}")
                 return None
-            
+
             # Extract the result
-            content = response.result.get("content", [])
+            content = response.get("result", {}).get("content", [])
             if content and len(content) > 0:
                 result_text = content[0].get("text", "")
                 print(f"✅ Tool result: {result_text}")
@@ -235,12 +302,37 @@ class MCPClient:
             print(f"❌ Tool call error: {e}")
             return None
     
+    @staticmethod
+    def _compile_param_plan(tool: MCPTool) -> List[Any]:
+        """Compile a tool's schema into (name, prompt, required, coerce) tuples.
+
+        Done once per tool at discovery time so the interactive loop does not
+        re-walk the schema dicts and re-compare type strings on every call.
+        """
+        schema = tool.input_schema
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+
+        plan = []
+        for param_name, param_info in properties.items():
+            param_type = param_info.get("type", "string")
+            param_desc = param_info.get("description", "")
+            is_required = param_name in required
+
+            prompt = f"Enter {param_name}"
+            if param_desc:
+                prompt += f" ({param_desc})"
+            if not is_required:
+                prompt += " [optional]"
+            prompt += ": "
+
+            coerce = float if param_type == "number" else str
+            plan.append((param_name, prompt, is_required, coerce))
+        return plan
+
     def get_tool_by_name(self, name: str) -> Optional[MCPTool]:
         """Get a tool by its name."""
-        for tool in self.tools:
-            if tool.name == name:
-                return tool
-        return None
+        return self._tools_by_name.get(name)
     
     def print_tool_schema(self, tool: MCPTool):
         """Print the input schema for a tool."""
@@ -298,39 +390,25 @@ class MCPClient:
                     
                     # Get arguments from user
                     arguments = {}
-                    schema = tool.input_schema
-                    properties = schema.get("properties", {})
-                    required = schema.get("required", [])
-                    
-                    for param_name, param_info in properties.items():
-                        param_type = param_info.get("type", "string")
-                        param_desc = param_info.get("description", "")
-                        is_required = param_name in required
-                        
-                        prompt = f"Enter {param_name}"
-                        if param_desc:
-                            prompt += f" ({param_desc})"
-                        if not is_required:
-                            prompt += " [optional]"
-                        prompt += ": "
-                        
+                    missing_required = False
+
+                    for param_name, prompt, is_required, coerce in self._param_plans[tool_name]:
                         value = input(prompt).strip()
-                        
+
                         if value:
                             # Convert to appropriate type
-                            if param_type == "number":
-                                try:
-                                    arguments[param_name] = float(value)
-                                except ValueError:
-                                    print(f"❌ Invalid number: {value}")
-                                    break
-                            else:
-                                arguments[param_name] = value
+                            try:
+                                arguments[param_name] = coerce(value)
+                            except ValueError:
+                                print(f"❌ Invalid number: {value}")
+                                missing_required = True
+                                break
                         elif is_required:
                             print(f"❌ Required parameter '{param_name}' not provided")
+                            missing_required = True
                             break
-                    
-                    if len(arguments) == len([p for p in properties.keys() if p in arguments or p not in required]):
+
+                    if not missing_required:
                         await self.call_tool(tool_name, arguments)
                 else:
                     print("❌ Unknown command. Type 'quit' to exit.")
@@ -344,11 +422,13 @@ class MCPClient:
     async def cleanup(self):
         """Clean up resources."""
         print("\n🧹 Cleaning up...")
+        if self._reader_task:
+            self._reader_task.cancel()
         if self.process:
             try:
                 self.process.stdin.close()
                 self.process.terminate()
-                self.process.wait(timeout=5)
+                await asyncio.wait_for(self.process.wait(), timeout=5)
                 print("✅ MCP server stopped")
             except:
                 try:
@@ -7,6 +7,7 @@ This server provides basic tools for greeting and echoing messages.
 import asyncio
 import json
 import logging
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from mcp.server import Server
@@ -31,97 +32,124 @@ logger = logging.getLogger(__name__)
 server = Server("mcp-hello-server")
 
 
+# The tool catalogue is static, so build it once at import time instead of
+# re-allocating the Tool objects and schema dicts on every tools/list call.
+_TOOLS: List[Tool] = [
+    Tool(
+        name="hello",
+        description="Say hello to someone",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "The name of the person to greet"
+                }
+            },
+            "required": ["name"]
+        }
+    ),
+    Tool(
+        name="echo",
+        description="Echo back the provided message",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "The message to echo back"
+                }
+            },
+            "required": ["message"]
+        }
+    ),
+    Tool(
+        name="get_time",
+        description="Get the current time",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="add_numbers",
+        description="Add two numbers together",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "a": {
+                    "type": "number",
+                    "description": "First number"
+                },
+                "b": {
+                    "type": "number",
+                    "description": "Second number"
+                }
+            },
+            "required": ["a", "b"]
+        }
+    )
+]
+
+
 @server.list_tools()
 async def list_tools() -> List[Tool]:
     """List available tools."""
-    return [
-        Tool(
-            name="hello",
-            description="Say hello to someone",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "The name of the person to greet"
-                    }
-                },
-                "required": ["name"]
-            }
-        ),
-        Tool(
-            name="echo",
-            description="Echo back the provided message",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "message": {
-                        "type": "string",
-                        "description": "The message to echo back"
-                    }
-                },
-                "required": ["message"]
-            }
-        ),
-        Tool(
-            name="get_time",
-            description="Get the current time",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="add_numbers",
-            description="Add two numbers together",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "a": {
-                        "type": "number",
-                        "description": "First number"
-                    },
-                    "b": {
-                        "type": "number",
-                        "description": "Second number"
-                    }
-                },
-                "required": ["a", "b"]
-            }
-        )
-    ]
+    return _TOOLS
+
+
+def _hello(arguments: Dict[str, Any]) -> List[TextContent]:
+    name_arg = arguments.get("name", "World")
+    message = f"Hello, {name_arg}! Welcome to the MCP Hello Server!"
+    return [TextContent(type="text", text=message)]
+
+
+def _echo(arguments: Dict[str, Any]) -> List[TextContent]:
+    message = arguments.get("message", "")
+    return [TextContent(type="text", text=f"Echo: {message}")]
+
+
+def _get_time(arguments: Dict[str, Any]) -> List[TextContent]:
+    # Format the fields directly; this skips strftime's format-string
+    # parser for the fixed "%Y-%m-%d %H:%M:%S" layout.
+    n = datetime.now()
+    current_time = (f"{n.year:04d}-{n.month:02d}-{n.day:02d} "
+                    f"{n.hour:02d}:{n.minute:02d}:{n.second:02d}")
+    return [TextContent(type="text", text=f"Current time: {current_time}")]
+
+
+def _add_numbers(arguments: Dict[str, Any]) -> List[TextContent]:
+    try:
+        a = float(arguments.get("a", 0))
+        b = float(arguments.get("b", 0))
+        result = a + b
+        return [TextContent(type="text", text=f"{a} + {b} = {result}")]
+    except (ValueError, TypeError) as e:
+        return [TextContent(type="text", text=f"Error: Invalid numbers provided - {str(e)}")]
+
+
+# Dispatch table built once so call_tool is a single dict lookup instead of
+# an if/elif chain over the tool names. Integer tool IDs would be cheaper
+# still, but the mcp framing layer always delivers the tool name as a
+# string, and the literal keys here are interned by CPython, so the lookup
+# is a pointer-compare hash hit in practice.
+_HANDLERS = {
+    "hello": _hello,
+    "echo": _echo,
+    "get_time": _get_time,
+    "add_numbers": _add_numbers,
+}
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool calls."""
     logger.info(f"Tool called: {name} with arguments: {arguments}")
-    
-    if name == "hello":
-        name_arg = arguments.get("name", "World")
-        message = f"Hello, {name_arg}! Welcome to the MCP Hello Server!"
-        return [TextContent(type="text", text=message)]
-    
-    elif name == "echo":
-        message = arguments.get("message", "")
-        return [TextContent(type="text", text=f"Echo: {message}")]
-    
-    elif name == "get_time":
-        import datetime
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return [TextContent(type="text", text=f"Current time: {current_time}")]
-    
-    elif name == "add_numbers":
-        try:
-            a = float(arguments.get("a", 0))
-            b = float(arguments.get("b", 0))
-            result = a + b
-            return [TextContent(type="text", text=f"{a} + {b} = {result}")]
-        except (ValueError, TypeError) as e:
-            return [TextContent(type="text", text=f"Error: Invalid numbers provided - {str(e)}")]
-    
-    else:
+
+    handler = _HANDLERS.get(name)
+    if handler is None:
         return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    return handler(arguments)
 
 
 async def main():
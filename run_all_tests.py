@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Run all MCP test scripts concurrently.
+
+Each script starts (or imports) its own server, so they are independent
+and can run in parallel - one OS process per script, true parallelism
+with no shared GIL. Total wall time approaches the slowest script
+instead of the sum of all of them.
+"""
+
+import asyncio
+import sys
+import time
+
+TEST_SCRIPTS = [
+    "test_simple.py",
+    "test_manual.py",
+    "test_complete.py",
+    "test_cline_connection.py",
+    "test_interactive.py",
+    "test_server.py",
+    # Consolidated runner: every scenario above against one shared server
+    "test_scenarios.py",
+]
+
+
+async def run_script(script: str):
+    """Run one test script and capture its combined output."""
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, script,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    output, _ = await process.communicate()
+    return script, process.returncode, time.perf_counter() - start, output
+
+
+async def main():
+    print("🎯 Running all test scripts concurrently")
+    print("========================================")
+
+    results = await asyncio.gather(*(run_script(s) for s in TEST_SCRIPTS))
+
+    failed = 0
+    for script, returncode, elapsed, output in results:
+        status = "✅" if returncode == 0 else "❌"
+        print(f"\n{status} {script} (exit {returncode}, {elapsed:.2f}s)")
+        print(output.decode(errors="replace"))
+        if returncode != 0:
+            failed += 1
+
+    if failed:
+        print(f"\n❌ {failed} script(s) failed")
+        sys.exit(1)
+    print("\n✅ All scripts passed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
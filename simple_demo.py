@@ -4,56 +4,115 @@ MCP Client Demo - Demonstrates the complete MCP lifecycle
 """
 
 import asyncio
+import itertools
 import json
-import subprocess
 import sys
 import time
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
+# Use orjson on the send/recv path when available - C-level parsing and
+# bytes output without the dump-to-str-then-encode double pass
+try:
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _json_loads = json.loads
+
 
 @dataclass
 class MCPTool:
     """Represents an MCP tool."""
+    __slots__ = ("name", "description", "input_schema")
     name: str
     description: str
     input_schema: Dict[str, Any]
 
+    @classmethod
+    def from_dict(cls, tool_data: Dict[str, Any]) -> "MCPTool":
+        """Build a tool straight from a tools/list entry."""
+        return cls(tool_data["name"], tool_data["description"], tool_data["inputSchema"])
+
+
+# These handshake payloads never change, so build (and for the
+# notification, serialize) them once at import time instead of on every
+# connection
+_INIT_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "capabilities": {},
+    "clientInfo": {
+        "name": "simple-mcp-client",
+        "version": "1.0.0"
+    }
+}
+_INITIALIZED_NOTIFICATION = (
+    _json_dumps({"jsonrpc": "2.0", "method": "notifications/initialized"}) + b"\n"
+)
+
 
 class SimpleMCPClient:
     """A simple MCP client that demonstrates the complete MCP lifecycle."""
     
-    def __init__(self, server_command: List[str], server_cwd: str = None):
+    def __init__(self, server_command: List[str], server_cwd: str = None, verbose: bool = False):
         self.server_command = server_command
         self.server_cwd = server_cwd
-        self.process: Optional[subprocess.Popen] = None
+        # Progress chatter is off by default so the RPC hot path does no
+        # per-call formatting or stdout flushes; errors always print
+        self.verbose = verbose
+        self.process: Optional[asyncio.subprocess.Process] = None
         self.tools: List[MCPTool] = []
         self.initialized = False
-        self.request_id = 0
+        self._next_id = itertools.count(1).__next__
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._reader_task: Optional[asyncio.Task] = None
+        # Drained stderr lines - keeps a chatty server from filling its
+        # 64 KiB pipe and wedging, and doubles as a diagnostic buffer
+        self._stderr_task: Optional[asyncio.Task] = None
+        self._stderr_buf: List[bytes] = []
+        # Outgoing frames queued within one event-loop tick are flushed
+        # together with a single writelines call
+        self._write_buffer: List[bytes] = []
+        self._flush_scheduled = False
+        # Reusable request envelopes - one shape per message kind so dict
+        # layout stays stable and no envelope is allocated per call. Safe
+        # because each one is serialized before the next mutation.
+        self._envelope = {"jsonrpc": "2.0", "id": 0, "method": ""}
+        self._envelope_with_params = {"jsonrpc": "2.0", "id": 0, "method": "", "params": None}
     
     def _get_next_id(self) -> int:
         """Get the next request ID."""
-        self.request_id += 1
-        return self.request_id
+        return self._next_id()
     
     async def start_server(self) -> bool:
         """Start the MCP server process."""
-        print("🚀 Starting MCP server...")
+        if self.verbose:
+            print("🚀 Starting MCP server...")
         try:
-            self.process = subprocess.Popen(
-                self.server_command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=self.server_cwd
+            self.process = await asyncio.create_subprocess_exec(
+                *self.server_command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.server_cwd,
+                # Large tools/list or tools/call replies must fit in the
+                # stream buffer, or readuntil raises LimitOverrunError
+                limit=4 * 1024 * 1024
             )
-            
-            # Give the server a moment to start
-            await asyncio.sleep(0.5)
-            
-            if self.process.poll() is None:
-                print("✅ MCP server started successfully!")
+
+            # No warmup sleep - readiness is confirmed by the server
+            # answering the initialize request
+            if self.process.returncode is None:
+                self._reader_task = asyncio.create_task(self._reader_loop())
+                self._stderr_task = asyncio.create_task(self._drain_stderr())
+                if self.verbose:
+                    print("✅ MCP server started successfully!")
                 return True
             else:
                 print("❌ MCP server failed to start")
@@ -63,86 +122,131 @@ class SimpleMCPClient:
             print(f"❌ Error starting MCP server: {e}")
             return False
     
+    def _queue_write(self, *chunks: bytes):
+        """Queue frame chunks and flush them once per event-loop tick."""
+        self._write_buffer.extend(chunks)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_writes)
+
+    def _flush_writes(self):
+        self._flush_scheduled = False
+        if self._write_buffer:
+            self.process.stdin.writelines(self._write_buffer)
+            self._write_buffer.clear()
+
+    async def _flush_and_drain(self):
+        """Yield until the scheduled flush has run, then apply backpressure.
+
+        The flush callback is queued ahead of this coroutine's wakeup, so
+        after the yield the buffered frames have reached the transport and
+        drain() measures real outstanding bytes - awaiting drain() before
+        the flush would be a no-op.
+        """
+        await asyncio.sleep(0)
+        self._flush_writes()
+        await self.process.stdin.drain()
+
+    async def _drain_stderr(self):
+        """Consume server stderr so its pipe never backs up."""
+        async for line in self.process.stderr:
+            self._stderr_buf.append(line)
+
+    async def _reader_loop(self):
+        """Dispatch each response line to the request waiting on its id."""
+        while True:
+            try:
+                line = await self.process.stdout.readuntil(b"\n")
+            except asyncio.IncompleteReadError:
+                break
+            try:
+                msg = _json_loads(line)
+            except ValueError:
+                continue
+            future = self._pending.pop(msg.get("id"), None)
+            if future and not future.done():
+                future.set_result(msg)
+
+        # EOF - fail whatever is still waiting
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("No response from server"))
+        self._pending.clear()
+
     async def send_request(self, method: str, params: Dict[str, Any] = None, request_id: int = None) -> Dict[str, Any]:
         """Send a JSON-RPC request to the MCP server."""
-        if not self.process or self.process.poll() is not None:
-            raise Exception("MCP server is not running")
-        
+        if not self.process or self.process.returncode is not None:
+            raise RuntimeError("MCP server is not running")
+
         if request_id is None:
             request_id = self._get_next_id()
-        
-        request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": method
-        }
-        
+
         if params:
+            request = self._envelope_with_params
             request["params"] = params
-        
-        print(f"📤 Sending request: {method}")
-        
-        # Send the request
-        self.process.stdin.write(json.dumps(request) + "\n")
-        self.process.stdin.flush()
-        
-        # Read the response
-        response_line = self.process.stdout.readline()
-        if not response_line:
-            raise Exception("No response from server")
-        
-        try:
-            response_data = json.loads(response_line.strip())
+        else:
+            request = self._envelope
+        request["id"] = request_id
+        request["method"] = method
+
+        if self.verbose:
+            print(f"📤 Sending request: {method}")
+
+        # Register a future for the response, then send the request; other
+        # requests can be written while this one is still in flight
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._queue_write(_json_dumps(request), b"\n")
+        await self._flush_and_drain()
+
+        response_data = await future
+        if self.verbose:
             print(f"📥 Received response for {method}")
-            return response_data
-        except json.JSONError as e:
-            raise Exception(f"Invalid JSON response: {e}")
+        return response_data
     
     async def initialize(self) -> bool:
         """Initialize the MCP connection."""
-        print("\n🤝 Initializing MCP connection...")
+        if self.verbose:
+            print("\n🤝 Initializing MCP connection...")
         
         try:
-            response = await self.send_request(
-                "initialize",
-                {
-                    "protocolVersion": "2024-11-05",
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "simple-mcp-client",
-                        "version": "1.0.0"
-                    }
-                }
-            )
+            try:
+                response = await asyncio.wait_for(
+                    self.send_request("initialize", _INIT_PARAMS), timeout=5.0
+                )
+            except asyncio.TimeoutError:
+                print("❌ Initialization timed out - server never answered")
+                if self._stderr_buf:
+                    stderr = b"".join(self._stderr_buf)
+                    print(f"   Server stderr: {stderr.decode(errors='replace').strip()}")
+                return False
             
             if "error" in response:
                 print(f"❌ Initialization failed: {response['error']}")
                 return False
             
-            print("✅ MCP connection initialized!")
-            server_info = response.get("result", {}).get("serverInfo", {})
-            print(f"   Server: {server_info.get('name', 'Unknown')}")
-            print(f"   Version: {server_info.get('version', 'Unknown')}")
-            
-            # Send initialized notification
-            notification = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized"
-            }
-            print(f"📢 Sending notification: notifications/initialized")
-            self.process.stdin.write(json.dumps(notification) + "\n")
-            self.process.stdin.flush()
+            if self.verbose:
+                server_info = response["result"].get("serverInfo", {})
+                print("✅ MCP connection initialized!")
+                print(f"   Server: {server_info.get('name', 'Unknown')}")
+                print(f"   Version: {server_info.get('version', 'Unknown')}")
+                print(f"📢 Sending notification: notifications/initialized")
+
+            # Send initialized notification (pre-serialized at import time)
+            self._queue_write(_INITIALIZED_NOTIFICATION)
+            await self._flush_and_drain()
             
             self.initialized = True
             return True
-            
-        except Exception as e:
+
+        except (RuntimeError, ConnectionError, OSError, KeyError, ValueError) as e:
             print(f"❌ Initialization error: {e}")
             return False
     
     async def discover_tools(self) -> bool:
         """Discover available tools from the MCP server."""
-        print("\n🔍 Discovering available tools...")
+        if self.verbose:
+            print("\n🔍 Discovering available tools...")
         
         try:
             response = await self.send_request("tools/list")
@@ -151,31 +255,27 @@ class SimpleMCPClient:
                 print(f"❌ Tool discovery failed: {response['error']}")
                 return False
             
-            tools_data = response.get("result", {}).get("tools", [])
-            self.tools = []
-            
-            for tool_data in tools_data:
-                tool = MCPTool(
-                    name=tool_data["name"],
-                    description=tool_data["description"],
-                    input_schema=tool_data["inputSchema"]
-                )
-                self.tools.append(tool)
-            
-            print(f"✅ Found {len(self.tools)} tools:")
-            for tool in self.tools:
-                print(f"   • {tool.name}: {tool.description}")
+            self.tools = [
+                MCPTool.from_dict(tool_data) for tool_data in response["result"]["tools"]
+            ]
+
+            if self.verbose:
+                print(f"✅ Found {len(self.tools)} tools:")
+                for tool in self.tools:
+                    print(f"   • {tool.name}: {tool.description}")
             
             return True
-            
-        except Exception as e:
+
+        except (RuntimeError, ConnectionError, OSError, KeyError, ValueError) as e:
             print(f"❌ Tool discovery error: {e}")
             return False
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[str]:
         """Call a tool with the given arguments."""
-        print(f"\n🔧 Calling tool: {tool_name}")
-        print(f"   Arguments: {arguments}")
+        # The verbose gate short-circuits before arguments.__repr__ runs,
+        # so disabled chatter costs nothing even for large argument dicts
+        if self.verbose:
+            print(f"\n🔧 Calling tool: {tool_name}\n   Arguments: {arguments!r}")
         
         try:
             response = await self.send_request(
@@ -191,33 +291,46 @@ class SimpleMCPClient:
                 return None
             
             # Extract the result
-            content = response.get("result", {}).get("content", [])
-            if content and len(content) > 0:
+            content = response["result"]["content"]
+            if content:
                 result_text = content[0].get("text", "")
-                print(f"✅ Tool result: {result_text}")
+                if self.verbose:
+                    print(f"✅ Tool result: {result_text}")
                 return result_text
             else:
                 print("⚠️ Tool returned no content")
                 return None
-                
-        except Exception as e:
+
+        except (RuntimeError, ConnectionError, OSError, KeyError, ValueError) as e:
             print(f"❌ Tool call error: {e}")
             return None
     
     async def cleanup(self):
         """Clean up resources."""
-        print("\n🧹 Cleaning up...")
+        if self.verbose:
+            print("\n🧹 Cleaning up...")
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._stderr_task:
+            self._stderr_task.cancel()
         if self.process:
             try:
+                # Empty the write buffer first so a still-pending flush
+                # callback cannot write after the close below
+                self._flush_writes()
                 self.process.stdin.close()
                 self.process.terminate()
-                self.process.wait(timeout=5)
-                print("✅ MCP server stopped")
-            except:
                 try:
+                    await asyncio.wait_for(self.process.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    # Escalate: SIGTERM was ignored, so force it down and
+                    # reap the zombie
                     self.process.kill()
-                except:
-                    pass
+                    await self.process.wait()
+                if self.verbose:
+                    print("✅ MCP server stopped")
+            except ProcessLookupError:
+                pass
 
 
 async def demo_lifecycle():
@@ -229,7 +342,7 @@ async def demo_lifecycle():
     server_command = [".venv\\Scripts\\python.exe", "-m", "mcp_hello_server.main"]
     server_cwd = "C:\\dev\\code\\MCP-Server"
     
-    client = SimpleMCPClient(server_command, server_cwd)
+    client = SimpleMCPClient(server_command, server_cwd, verbose=True)
     
     try:
         print("\n📋 MCP Lifecycle Steps:")
@@ -260,23 +373,20 @@ async def demo_lifecycle():
         
         # Step 4: Demo tool calls
         print("\nStep 4: Demonstrating tool calls...")
-        
-        # Call hello tool
-        print("\n🔧 Calling 'hello' tool:")
-        await client.call_tool("hello", {"name": "MCP Demo User"})
-        
-        # Call echo tool
-        print("\n🔧 Calling 'echo' tool:")
-        await client.call_tool("echo", {"message": "Hello from MCP Client Demo!"})
-        
-        # Call get_time tool
-        print("\n🔧 Calling 'get_time' tool:")
-        await client.call_tool("get_time", {})
-        
-        # Call add_numbers tool
-        print("\n🔧 Calling 'add_numbers' tool:")
-        await client.call_tool("add_numbers", {"a": 42, "b": 8})
-        
+
+        # All four calls are independent, so pipeline them in one gather
+        # instead of paying four sequential round-trips
+        results = await asyncio.gather(
+            client.call_tool("hello", {"name": "MCP Demo User"}),
+            client.call_tool("echo", {"message": "Hello from MCP Client Demo!"}),
+            client.call_tool("get_time", {}),
+            client.call_tool("add_numbers", {"a": 42, "b": 8}),
+        )
+
+        print("\n📊 Tool call results:")
+        for tool_name, result in zip(("hello", "echo", "get_time", "add_numbers"), results):
+            print(f"   • {tool_name}: {result}")
+
         print("\n✅ Demo completed successfully!")
         print("\n🎮 To try interactive mode, run: py mcp_client/client.py")
         
@@ -3,9 +3,12 @@
 Test script to verify Cline can connect to our MCP server
 """
 
+import os
+import selectors
 import subprocess
 import sys
 import json
+import threading
 import time
 
 
@@ -30,8 +33,12 @@ def test_cline_connection():
         {"jsonrpc": "2.0", "id": 2, "method": "tools/list"}
     ]
     
-    input_data = "\n".join(json.dumps(msg) for msg in messages)
-    
+    # One contiguous bytes buffer so all messages cross the pipe in a
+    # single write; compact separators keep the payload small
+    input_bytes = b"".join(
+        json.dumps(msg, separators=(",", ":")).encode() + b"\n" for msg in messages
+    )
+
     try:
         # Start the server process
         process = subprocess.Popen(
@@ -39,34 +46,123 @@ def test_cline_connection():
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
             cwd="C:\\dev\\code\\MCP-Server"
         )
-        
-        # Send test messages
-        stdout, stderr = process.communicate(input=input_data, timeout=10)
-        
+
+        # Feed the batched input from a background thread so responses can
+        # be parsed here as the server produces them, without buffering the
+        # whole output first
+        def _feed_stdin():
+            process.stdin.write(input_bytes)
+            process.stdin.close()
+
+        writer = threading.Thread(target=_feed_stdin)
+        writer.start()
+
         print("✅ Server started successfully!")
         print("✅ Received responses:")
-        
-        # Parse responses
-        response_lines = stdout.strip().split('\n')
-        for i, line in enumerate(response_lines, 1):
-            if line.strip():
+
+        # Only id-bearing messages produce a response
+        expected = sum(1 for msg in messages if "id" in msg)
+
+        def _print_response(response, number):
+            if response.get("result", {}).get("tools"):
+                print(f"  ✅ Found {len(response['result']['tools'])} tools:")
+                for tool in response['result']['tools']:
+                    print(f"    - {tool['name']}: {tool['description']}")
+            else:
+                print(f"  ✅ Response {number}: {response.get('method', 'Unknown')}")
+
+        err_buf = bytearray()
+        received = 0
+        err_thread = None
+
+        if os.name != "nt":
+            # Bounded selector loop draining stdout and stderr together:
+            # no unbounded readline that could hang on a wedged server,
+            # and a chatty server cannot fill the stderr pipe and
+            # deadlock the test
+            os.set_blocking(process.stdout.fileno(), False)
+            os.set_blocking(process.stderr.fileno(), False)
+            sel = selectors.DefaultSelector()
+            sel.register(process.stdout, selectors.EVENT_READ, data="out")
+            sel.register(process.stderr, selectors.EVENT_READ, data="err")
+
+            out_buf = b""
+            eof = False
+            deadline = time.monotonic() + 10
+            while received < expected and not eof:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print("❌ Timed out waiting for responses")
+                    break
+                for key, _ in sel.select(timeout=remaining):
+                    data = os.read(key.fileobj.fileno(), 65536)
+                    if not data:
+                        sel.unregister(key.fileobj)
+                        if key.data == "out":
+                            eof = True
+                        continue
+                    if key.data == "err":
+                        err_buf += data
+                        continue
+                    out_buf += data
+                    while b"\n" in out_buf:
+                        line, out_buf = out_buf.split(b"\n", 1)
+                        if not line.strip():
+                            continue
+                        try:
+                            response = json.loads(line)
+                        except ValueError:
+                            print(f"  ✅ Non-JSON output: {line.decode(errors='replace')}")
+                            continue
+                        received += 1
+                        _print_response(response, received)
+            sel.close()
+        else:
+            # Windows: select() rejects pipe handles, so fall back to
+            # blocking readlines with stderr drained by a thread (the
+            # bound comes from wait(timeout=) below)
+            def _drain_stderr():
+                err_buf.extend(process.stderr.read())
+
+            err_thread = threading.Thread(target=_drain_stderr)
+            err_thread.start()
+            while received < expected:
+                line = process.stdout.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
                 try:
                     response = json.loads(line)
-                    if response.get("result", {}).get("tools"):
-                        print(f"  ✅ Found {len(response['result']['tools'])} tools:")
-                        for tool in response['result']['tools']:
-                            print(f"    - {tool['name']}: {tool['description']}")
-                    else:
-                        print(f"  ✅ Response {i}: {response.get('method', 'Unknown')}")
-                except json.JSONError:
-                    print(f"  ✅ Non-JSON output {i}: {line}")
-        
-        if stderr:
+                except ValueError:
+                    print(f"  ✅ Non-JSON output: {line.decode(errors='replace')}")
+                    continue
+                received += 1
+                _print_response(response, received)
+
+        writer.join()
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait(timeout=10)
+
+        if err_thread is not None:
+            err_thread.join(timeout=5)
+        else:
+            # Pick up any last log lines left in the (non-blocking) pipe
+            try:
+                while chunk := os.read(process.stderr.fileno(), 65536):
+                    err_buf += chunk
+            except (BlockingIOError, OSError):
+                pass
+
+        if err_buf:
             print("Server logs:")
-            print(stderr)
+            print(err_buf.decode(errors="replace"))
         
         print()
         print("🎉 Cline should be able to connect to your MCP server!")
@@ -4,8 +4,11 @@ Complete MCP Server Test
 This demonstrates the full MCP protocol flow.
 """
 
+import os
+import selectors
 import subprocess
 import sys
+import threading
 import time
 import json
 
@@ -34,8 +37,11 @@ def test_complete_flow():
         {"jsonrpc": "2.0", "id": 6, "method": "tools/call", "params": {"name": "add_numbers", "arguments": {"a": 5, "b": 3}}}
     ]
     
-    # Convert to JSON lines
-    input_data = "\n".join(json.dumps(msg) for msg in messages)
+    # Convert to one contiguous JSON-lines bytes buffer so the whole batch
+    # is submitted in a single write
+    input_bytes = b"".join(
+        json.dumps(msg, separators=(",", ":")).encode() + b"\n" for msg in messages
+    )
     
     print("Sending test messages to server...")
     print("Input messages:")
@@ -49,29 +55,115 @@ def test_complete_flow():
             [".venv\\Scripts\\python.exe", "-m", "mcp_hello_server.main"],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stderr=subprocess.PIPE
         )
-        
-        # Send all messages at once
-        stdout, stderr = process.communicate(input=input_data, timeout=10)
-        
+
+        # Send all messages from a background thread and stream responses
+        # as the server produces them instead of buffering everything in
+        # communicate()
+        def _feed_stdin():
+            process.stdin.write(input_bytes)
+            process.stdin.close()
+
+        writer = threading.Thread(target=_feed_stdin)
+        writer.start()
+
+        # Only id-bearing messages produce a response; stop reading as soon
+        # as the last one is in rather than waiting for the server to close
+        # its end of the pipe
+        expected = sum(1 for msg in messages if "id" in msg)
+
         print("Server responses:")
         print("=" * 50)
-        
-        # Parse and display responses
-        response_lines = stdout.strip().split('\n')
-        for i, line in enumerate(response_lines, 1):
-            if line.strip():
+
+        err_buf = bytearray()
+        received = 0
+        err_thread = None
+
+        if os.name != "nt":
+            # Bounded selector loop instead of bare readline: a server
+            # that stalls before the last response cannot hang the test,
+            # and stderr is drained as it arrives so a chatty server
+            # cannot fill its pipe and deadlock
+            os.set_blocking(process.stdout.fileno(), False)
+            os.set_blocking(process.stderr.fileno(), False)
+            sel = selectors.DefaultSelector()
+            sel.register(process.stdout, selectors.EVENT_READ, data="out")
+            sel.register(process.stderr, selectors.EVENT_READ, data="err")
+
+            out_buf = b""
+            eof = False
+            deadline = time.monotonic() + 10
+            while received < expected and not eof:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print("❌ Timed out waiting for responses")
+                    break
+                for key, _ in sel.select(timeout=remaining):
+                    data = os.read(key.fileobj.fileno(), 65536)
+                    if not data:
+                        sel.unregister(key.fileobj)
+                        if key.data == "out":
+                            eof = True
+                        continue
+                    if key.data == "err":
+                        err_buf += data
+                        continue
+                    out_buf += data
+                    while b"\n" in out_buf:
+                        line, out_buf = out_buf.split(b"\n", 1)
+                        if not line.strip():
+                            continue
+                        try:
+                            response = json.loads(line)
+                            received += 1
+                            print(f"Response {received}:")
+                            print(json.dumps(response, indent=2))
+                            print()
+                        except ValueError:
+                            print(f"Non-JSON output: {line.decode(errors='replace')}")
+                            print()
+            sel.close()
+        else:
+            # Windows: select() rejects pipe handles, so fall back to
+            # blocking readlines with stderr drained by a thread (the
+            # bound comes from wait(timeout=) below)
+            def _drain_stderr():
+                err_buf.extend(process.stderr.read())
+
+            err_thread = threading.Thread(target=_drain_stderr)
+            err_thread.start()
+            while received < expected:
+                line = process.stdout.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
                 try:
                     response = json.loads(line)
-                    print(f"Response {i}:")
+                    received += 1
+                    print(f"Response {received}:")
                     print(json.dumps(response, indent=2))
                     print()
-                except json.JSONError:
-                    print(f"Non-JSON output {i}: {line}")
+                except ValueError:
+                    print(f"Non-JSON output: {line.decode(errors='replace')}")
                     print()
-        
+
+        writer.join()
+        process.terminate()
+        process.wait(timeout=10)
+
+        if err_thread is not None:
+            err_thread.join(timeout=5)
+        else:
+            # Pick up any last log lines left in the (non-blocking) pipe
+            try:
+                while chunk := os.read(process.stderr.fileno(), 65536):
+                    err_buf += chunk
+            except (BlockingIOError, OSError):
+                pass
+        stderr = err_buf.decode(errors="replace")
+
         if stderr:
             print("Server logs:")
             print("=" * 50)
@@ -7,7 +7,10 @@ Run this to test the server interactively.
 import asyncio
 import json
 import sys
-from mcp_hello_server import main
+
+# One server instance, imported once at module scope, is shared by all
+# five tests below - there is no per-test process or handshake to pay
+from mcp_hello_server import main, server
 
 
 async def interactive_test():
@@ -15,10 +18,7 @@ async def interactive_test():
     print("=== Interactive MCP Server Test ===")
     print("Testing server functions directly...")
     print()
-    
-    # Import the server components
-    from mcp_hello_server import server
-    
+
     # Test 1: List tools
     print("=== Test 1: List Tools ===")
     try:
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Consolidated MCP test scenarios.
+
+The standalone scripts (test_manual.py, test_complete.py, ...) each pay a
+fresh interpreter start and a fresh server handshake. This runner keeps
+their scenarios but shares one interpreter and ONE server process across
+all of them: start, initialize and discover once, then run every scenario
+against the same connection.
+"""
+
+import asyncio
+import sys
+import time
+
+from simple_demo import SimpleMCPClient
+
+SERVER_COMMAND = [sys.executable, "-m", "mcp_hello_server.main"]
+
+
+async def scenario_list_tools(client: SimpleMCPClient) -> bool:
+    """Tool discovery (the cline/interactive list check)."""
+    names = {tool.name for tool in client.tools}
+    print(f"   Tools: {sorted(names)}")
+    return {"hello", "echo", "get_time", "add_numbers"} <= names
+
+
+async def scenario_hello(client: SimpleMCPClient) -> bool:
+    """The manual-test hello call."""
+    result = await client.call_tool("hello", {"name": "Test User"})
+    print(f"   hello -> {result}")
+    return result is not None and "Hello, Test User!" in result
+
+
+async def scenario_echo(client: SimpleMCPClient) -> bool:
+    """The complete-flow echo call."""
+    result = await client.call_tool("echo", {"message": "Hello, MCP!"})
+    print(f"   echo -> {result}")
+    return result is not None and "Hello, MCP!" in result
+
+
+async def scenario_get_time(client: SimpleMCPClient) -> bool:
+    """The complete-flow get_time call."""
+    result = await client.call_tool("get_time", {})
+    print(f"   get_time -> {result}")
+    return bool(result)
+
+
+async def scenario_add_numbers(client: SimpleMCPClient) -> bool:
+    """The complete-flow add_numbers call."""
+    result = await client.call_tool("add_numbers", {"a": 5, "b": 3})
+    print(f"   add_numbers -> {result}")
+    return result is not None and "8" in result
+
+
+SCENARIOS = [
+    ("list_tools", scenario_list_tools),
+    ("hello", scenario_hello),
+    ("echo", scenario_echo),
+    ("get_time", scenario_get_time),
+    ("add_numbers", scenario_add_numbers),
+]
+
+
+async def main():
+    print("🎯 Consolidated MCP scenarios (one server, one interpreter)")
+    print("===========================================================")
+
+    client = SimpleMCPClient(SERVER_COMMAND)
+    start = time.perf_counter()
+    failed = 0
+    try:
+        # One startup + handshake amortized over every scenario below
+        if not await client.start_server() or not await client.initialize():
+            print("❌ Could not bring up the shared server")
+            sys.exit(1)
+        if not await client.discover_tools():
+            print("❌ Tool discovery failed")
+            sys.exit(1)
+
+        for name, scenario in SCENARIOS:
+            print(f"\n▶ {name}")
+            try:
+                ok = await scenario(client)
+            except Exception as e:
+                print(f"   error: {e}")
+                ok = False
+            print("   ✅ passed" if ok else "   ❌ failed")
+            if not ok:
+                failed += 1
+    finally:
+        await client.cleanup()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{'❌' if failed else '✅'} {len(SCENARIOS) - failed}/{len(SCENARIOS)} "
+          f"scenarios passed in {elapsed:.2f}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,117 +4,291 @@ Simple MCP Server Test
 This tests the server by running it and checking if it starts correctly.
 """
 
+import glob
+import importlib
+import io
+import selectors
 import subprocess
 import sys
 import time
 import os
+from pathlib import Path
+
+def _exists(path):
+    """stat-based existence check that does not mask permission errors.
+
+    os.path.exists swallows every OSError, so a venv locked by e.g. a
+    sync client looks identical to a missing one. Only a genuinely absent
+    path returns False here; PermissionError surfaces with context.
+    """
+    try:
+        os.stat(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except PermissionError as e:
+        raise PermissionError(f"Cannot stat {path} - check folder permissions") from e
+
+
+# Resolved once at import time: each check below is a single stat, the
+# interpreter path is built only once, and the script keeps working when
+# invoked from another cwd
+ROOT = Path(__file__).resolve().parent
+SERVER_DIR = ROOT / "mcp_hello_server"
+VENV_DIR = ROOT / ".venv"
+VENV_PY = VENV_DIR / ("Scripts/python.exe" if os.name == "nt" else "bin/python")
+# Fall back to the interpreter running this script when no venv exists
+# (e.g. CI with globally installed dependencies) so the test still runs
+# instead of failing fast
+PYTHON = str(VENV_PY) if _exists(VENV_PY) else sys.executable
+# Immutable argv built once - no per-call list allocation, and the
+# absolute interpreter path already skips any PATH lookup
+SERVER_CMD = (PYTHON, "-m", "mcp_hello_server.main")
+
+
+def _shutdown(process):
+    """Stop the server with a bounded escalation: TERM, then KILL.
+
+    An unbounded wait() could hang forever on a server that traps SIGTERM
+    to flush JSON-RPC state; this caps teardown at ~2 s worst case.
+    """
+    if process.poll() is None:
+        # Closing stdin first lets the stdio transport exit on EOF
+        process.stdin.close()
+        process.terminate()
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait(timeout=1.0)
+    elif not process.stdin.closed:
+        process.stdin.close()
+    # Release the pipe fds and their buffers promptly
+    process.stdout.close()
+    process.stderr.close()
 
 
 def test_server_startup():
     """Test if the server starts without errors."""
-    print("=== MCP Server Startup Test ===")
-    print("Testing if the server starts correctly...")
-    print()
-    
-    # Check if we're in the right directory
-    if not os.path.exists("mcp_hello_server"):
-        print("Error: mcp_hello_server directory not found!")
-        print("Make sure you're in the project root directory.")
-        return False
-    
-    # Check if virtual environment exists
-    if not os.path.exists(".venv"):
-        print("Error: Virtual environment not found!")
-        print("Run: py -m venv .venv")
-        return False
-    
-    # Test 1: Check if dependencies are installed
-    print("=== Test 1: Check Dependencies ===")
+    # Status lines are buffered and written once per test section - a
+    # handful of stdout writes instead of ~20 lock/encode/syscall round
+    # trips, and no interleaving with the server's own output
+    out = io.StringIO()
+
+    def say(*args):
+        print(*args, file=out)
+
+    def flush_say():
+        sys.stdout.write(out.getvalue())
+        out.seek(0)
+        out.truncate()
+
     try:
-        result = subprocess.run(
-            [".venv\\Scripts\\python.exe", "-c", "import mcp; print('MCP library imported successfully')"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        if result.returncode == 0:
-            print("✓ Dependencies are installed correctly")
-            print(f"  {result.stdout.strip()}")
-        else:
-            print("✗ Dependencies not installed properly")
-            print(f"  Error: {result.stderr}")
-            return False
-    except Exception as e:
-        print(f"✗ Error checking dependencies: {e}")
+        return _run_tests(say, flush_say)
+    finally:
+        flush_say()
+
+
+def _run_tests(say, flush_say):
+    say("=== MCP Server Startup Test ===")
+    say("Testing if the server starts correctly...")
+    say()
+
+    # Check the project layout
+    if not _exists(SERVER_DIR):
+        say("Error: mcp_hello_server directory not found!")
+        say("Make sure the script sits in the project root directory.")
         return False
-    
-    print()
-    
-    # Test 2: Check if server module can be imported
-    print("=== Test 2: Check Server Module ===")
+
+    # A missing venv is no longer fatal - the module constants fall back
+    # to the current interpreter
+    if not _exists(VENV_PY):
+        say("Note: virtual environment not found - using the current interpreter")
+        say("(create one with: py -m venv .venv)")
+        say()
+
+    # The server subprocess (Test 3) has no dependency on the import
+    # checks, so spawn it first: its interpreter boots while Tests 1 and 2
+    # run in this one, and by the time we wait on it the startup banner is
+    # usually already in the pipe. The three phases thus overlap instead
+    # of running strictly back to back. The server stays a subprocess even
+    # when this script runs under the venv interpreter itself: an in-thread
+    # runpy of mcp_hello_server.main could not be timed out or terminated
+    # cleanly, and would not exercise the real __main__ startup.
     try:
-        result = subprocess.run(
-            [".venv\\Scripts\\python.exe", "-c", "from mcp_hello_server import server; print('Server module imported successfully')"],
-            capture_output=True,
-            text=True,
-            timeout=10
+        # Keep this Popen on CPython's posix_spawn/vfork fast path: plain
+        # argv, no preexec_fn, default close_fds. That skips the fork()
+        # page-table copy on Linux/macOS; Windows uses CreateProcess
+        # either way. No -S/-I here: skipping site.py would also skip the
+        # venv's site-packages, which the server needs for the mcp import.
+        # Binary pipes: all reads go through os.read into bytearrays, so a
+        # TextIOWrapper would only add an unused incremental decoder; the
+        # stderr buffer is decoded once, and only on the failure path
+        # stdin must be a pipe we hold open: the stdio transport reads
+        # requests from it, and an immediate EOF (DEVNULL or inherited
+        # closed stdin) would make a healthy server shut itself down
+        # before the readiness check. It is closed in _shutdown.
+        process = subprocess.Popen(
+            SERVER_CMD,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
         )
-        if result.returncode == 0:
-            print("✓ Server module imports correctly")
-            print(f"  {result.stdout.strip()}")
-        else:
-            print("✗ Server module import failed")
-            print(f"  Error: {result.stderr}")
-            return False
-    except Exception as e:
-        print(f"✗ Error importing server module: {e}")
+    except OSError as e:
+        say(f"✗ Error starting server: {e}")
         return False
-    
-    print()
-    
-    # Test 3: Test server startup (briefly)
-    print("=== Test 3: Test Server Startup ===")
-    print("Starting server for 3 seconds to check for startup errors...")
-    
+
     try:
-        process = subprocess.Popen(
-            [".venv\\Scripts\\python.exe", "-m", "mcp_hello_server.main"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        # The import checks run in this interpreter instead of spawning the
+        # venv Python twice - each cold interpreter launch costs 100-300 ms,
+        # and a missing dependency now fails as an immediate ImportError
+        # instead of after a multi-second subprocess timeout.
+        # (A worker pool would not help here: ProcessPoolExecutor forks this
+        # interpreter, it cannot run the venv one, and there is nothing left
+        # to amortize once the probes are in-process. Both imports already
+        # share this one interpreter, so there is no pair of launches left
+        # to fuse into a combined -c script either.)
+        # Prepending the venv's site-packages makes its dependencies visible.
+        venv_site = (
+            glob.glob(str(VENV_DIR / "Lib" / "site-packages"))
+            + glob.glob(str(VENV_DIR / "lib" / "python3.*" / "site-packages"))
         )
-        
-        # Let it run for 3 seconds
-        time.sleep(3)
-        
-        # Check if it's still running (good sign)
-        if process.poll() is None:
-            print("✓ Server started and is running")
-            process.terminate()
-            process.wait()
-        else:
-            # Check what happened
-            stdout, stderr = process.communicate()
-            if stderr:
-                print("✗ Server exited with errors:")
-                print(f"  {stderr}")
-                return False
+        if venv_site:
+            sys.path.insert(0, venv_site[0])
+
+        # Test 1: Check if dependencies are installed
+        say("=== Test 1: Check Dependencies ===")
+        try:
+            importlib.import_module("mcp")
+            say("✓ Dependencies are installed correctly")
+            say("  MCP library imported successfully")
+        except ImportError as e:
+            say("✗ Dependencies not installed properly")
+            say(f"  Error: {e}")
+            return False
+
+        say()
+        flush_say()
+
+        # Test 2: Check if server module can be imported
+        say("=== Test 2: Check Server Module ===")
+        try:
+            # server lives as an attribute of the package, not a
+            # submodule, so mirror `from mcp_hello_server import server`
+            getattr(importlib.import_module("mcp_hello_server"), "server")
+            say("✓ Server module imports correctly")
+            say("  Server module imported successfully")
+        except (ImportError, AttributeError) as e:
+            say("✗ Server module import failed")
+            say(f"  Error: {e}")
+            return False
+
+        say()
+        flush_say()
+
+        # Test 3: Test server startup (briefly)
+        say("=== Test 3: Test Server Startup ===")
+        say("Waiting up to 3 seconds for the server to come up...")
+
+        try:
+            # Don't sleep a fixed 3 seconds: the server logs a startup banner
+            # to stderr almost immediately, so poll both pipes and break out
+            # the moment it appears (or the process dies), with 3 s as a
+            # monotonic deadline rather than a guaranteed cost
+            # Non-blocking pipes drained into bytearrays: a chatty startup can
+            # never fill the 64 KiB pipe buffer and deadlock us, and no final
+            # communicate() round-trip is needed. This only works on POSIX -
+            # Windows select() rejects pipe handles - so Windows keeps the
+            # simple bounded sleep-and-poll.
+            banner = ""
+            out_buf = bytearray()
+            err_buf = bytearray()
+            if os.name != "nt":
+                os.set_blocking(process.stdout.fileno(), False)
+                os.set_blocking(process.stderr.fileno(), False)
+
+                sel = selectors.DefaultSelector()
+                sel.register(process.stdout, selectors.EVENT_READ, data=out_buf)
+                sel.register(process.stderr, selectors.EVENT_READ, data=err_buf)
+                # On Linux a pidfd becomes readable the instant the child exits,
+                # so a crashed startup wakes the selector immediately instead of
+                # being noticed at the next poll
+                pidfd = None
+                if sys.platform == "linux" and hasattr(os, "pidfd_open"):
+                    try:
+                        pidfd = os.pidfd_open(process.pid)
+                        sel.register(pidfd, selectors.EVENT_READ, data="exit")
+                    except OSError:
+                        pidfd = None
+                deadline = time.monotonic() + 3.0
+                while process.poll() is None and not banner:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    for key, _ in sel.select(timeout=remaining):
+                        if key.data == "exit":
+                            # Child is gone; the loop condition picks up the
+                            # exit code via poll()
+                            break
+                        chunk = os.read(key.fileobj.fileno(), 4096)
+                        if chunk:
+                            buf = key.data
+                            buf += chunk
+                            if not banner and b"\n" in buf:
+                                banner = bytes(buf[:buf.index(b"\n")]).decode(errors="replace").strip()
+                sel.close()
+                if pidfd is not None:
+                    os.close(pidfd)
             else:
-                print("✓ Server started successfully")
-        
-    except Exception as e:
-        print(f"✗ Error starting server: {e}")
-        return False
-    
-    print()
-    print("=== All Tests Passed! ===")
-    print("The MCP server is working correctly.")
-    print()
-    print("Next steps:")
-    print("1. To run the server: .venv\\Scripts\\python.exe -m mcp_hello_server.main")
-    print("2. To test with an MCP client, use the configuration in mcp_config.json")
-    print("3. The server will listen for JSON-RPC messages on stdin")
-    
+                deadline = time.monotonic() + 3.0
+                while process.poll() is None and time.monotonic() < deadline:
+                    time.sleep(0.1)
+
+            # Check if it's still running (good sign)
+            if process.poll() is None:
+                say("✓ Server started and is running")
+                if banner:
+                    say(f"  {banner}")
+            else:
+                # Check what happened
+                if os.name != "nt":
+                    # Drain whatever is left of the non-blocking pipes
+                    # instead of a blocking communicate()
+                    for fileobj, buf in ((process.stdout, out_buf), (process.stderr, err_buf)):
+                        try:
+                            while chunk := os.read(fileobj.fileno(), 65536):
+                                buf += chunk
+                        except (BlockingIOError, OSError):
+                            pass
+                    stderr = err_buf.decode(errors="replace")
+                else:
+                    # Safe here: the process has already exited
+                    _, stderr_bytes = process.communicate()
+                    stderr = stderr_bytes.decode(errors="replace")
+                if stderr:
+                    say("✗ Server exited with errors:")
+                    say(f"  {stderr}")
+                    return False
+                else:
+                    say("✓ Server started successfully")
+
+        except Exception as e:
+            say(f"✗ Error starting server: {e}")
+            return False
+    finally:
+        # Reached on the early-return paths too - never leave the server
+        # subprocess running or its pipes open
+        _shutdown(process)
+
+    say()
+    say("=== All Tests Passed! ===")
+    say("The MCP server is working correctly.")
+    say()
+    say("Next steps:")
+    say("1. To run the server: .venv\\Scripts\\python.exe -m mcp_hello_server.main")
+    say("2. To test with an MCP client, use the configuration in mcp_config.json")
+    say("3. The server will listen for JSON-RPC messages on stdin")
+
     return True
 
 